@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 
@@ -14,7 +14,18 @@ class Base(DeclarativeBase):
 
 
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(bind=engine, autoflush=True, autocommit=False)
+SessionLocal = sessionmaker(bind=engine, autoflush=True, autocommit=False, expire_on_commit=False)
+
+
+@event.listens_for(engine, "connect")
+def _configure_sqlite_connection(dbapi_connection, connection_record) -> None:
+    # WAL lets websocket/bootstrap reads proceed while a score submission is writing.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
 
 
 def get_db():
@@ -23,3 +34,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_conn():
+    # Lightweight Core connection for read-only endpoints that don't need the ORM.
+    with engine.connect() as conn:
+        yield conn
@@ -1,25 +1,34 @@
 from __future__ import annotations
 
+import asyncio
+import json
 from collections import defaultdict
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from fastapi import Depends, FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import Connection, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, joinedload
 
-from app.database import Base, engine, get_db
-from app.models import Competition, CompetitionDriver, CompetitionJudge, Driver, GlobalClassification, Judge
+from app.database import Base, SessionLocal, engine, get_conn, get_db
+from app.models import Battle, Competition, CompetitionDriver, CompetitionJudge, Driver, GlobalClassification, Judge
 from app.schemas import (
+    BattleResultOut,
+    ClassificationStandingsOut,
+    CompetitionBattlesOut,
     CompetitionCreate,
     CompetitionDriversAssign,
     CompetitionJudgesAssign,
+    CompetitionStandingsOut,
     DriverCreate,
     GlobalClassificationCreate,
+    GroupStandingsOut,
     JudgeCreate,
+    QualifyingLeaderboardOut,
     QualifyingScoreUpsert,
     BattleRunScoreUpsert,
 )
@@ -31,6 +40,7 @@ from app.services import (
     get_competition_or_404,
     global_classification_standings,
     group_standings,
+    invalidate_roster_cache,
     list_competition_battles,
     qualifying_leaderboard,
     require_open_classification,
@@ -41,9 +51,20 @@ from app.services import (
 )
 
 
+BROADCAST_BATCH_SIZE = 50
+# Rows fetched per batch by the plain list endpoints.
+LIST_BATCH_SIZE = 500
+# Battle updates arriving within this window are coalesced into one broadcast.
+BROADCAST_DEBOUNCE_SECONDS = 0.05
+
+
 class LeaderboardHub:
     def __init__(self) -> None:
         self._connections: dict[int, set[WebSocket]] = defaultdict(set)
+        # Last bootstrap payload per competition, kept current by the write endpoints.
+        self._snapshots: dict[int, dict[str, Any]] = {}
+        self._pending: dict[int, asyncio.Task] = {}
+        self._pending_builders: dict[int, Callable[[], dict[str, Any]]] = {}
 
     async def connect(self, competition_id: int, ws: WebSocket) -> None:
         await ws.accept()
@@ -54,14 +75,54 @@ class LeaderboardHub:
             self._connections[competition_id].remove(ws)
             if not self._connections[competition_id]:
                 del self._connections[competition_id]
+                self._snapshots.pop(competition_id, None)
+
+    def snapshot(self, competition_id: int) -> Optional[dict[str, Any]]:
+        return self._snapshots.get(competition_id)
+
+    def store_snapshot(self, competition_id: int, snapshot: dict[str, Any]) -> None:
+        self._snapshots[competition_id] = snapshot
+
+    def update_snapshot(self, competition_id: int, **fields: Any) -> None:
+        snapshot = self._snapshots.get(competition_id)
+        if snapshot is not None:
+            snapshot.update(fields)
+
+    def invalidate(self, competition_id: int) -> None:
+        self._snapshots.pop(competition_id, None)
+
+    def mark_dirty(self, competition_id: int, build_payload: Callable[[], dict[str, Any]]) -> None:
+        """
+        Schedule a debounced broadcast for the competition.
+        Only the most recent builder runs, once, after BROADCAST_DEBOUNCE_SECONDS.
+        """
+        self._pending_builders[competition_id] = build_payload
+        if competition_id not in self._pending:
+            self._pending[competition_id] = asyncio.create_task(self._flush(competition_id))
+
+    async def _flush(self, competition_id: int) -> None:
+        await asyncio.sleep(BROADCAST_DEBOUNCE_SECONDS)
+        self._pending.pop(competition_id, None)
+        build_payload = self._pending_builders.pop(competition_id)
+        if competition_id not in self._connections:
+            return
+        await self.broadcast(competition_id, build_payload())
 
     async def broadcast(self, competition_id: int, payload: dict[str, Any]) -> None:
         targets = list(self._connections.get(competition_id, set()))
-        for ws in targets:
-            try:
-                await ws.send_json(payload)
-            except Exception:
-                self.disconnect(competition_id, ws)
+        if not targets:
+            return
+        # Encode once for the whole fanout; clients parse text frames with JSON.parse.
+        data = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+        failed: list[WebSocket] = []
+        for start in range(0, len(targets), BROADCAST_BATCH_SIZE):
+            batch = targets[start : start + BROADCAST_BATCH_SIZE]
+            results = await asyncio.gather(*(ws.send_text(data) for ws in batch), return_exceptions=True)
+            failed.extend(ws for ws, result in zip(batch, results) if isinstance(result, Exception))
+            # Yield between batches so large rosters don't monopolize the event loop.
+            await asyncio.sleep(0)
+        for ws in failed:
+            self.disconnect(competition_id, ws)
 
 
 app = FastAPI(
@@ -93,13 +154,24 @@ static_dir = Path(__file__).resolve().parent / "static"
 app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
 
-def _competition_summary(db: Session, competition: Competition) -> dict[str, Any]:
-    driver_count = (
-        db.query(CompetitionDriver).filter(CompetitionDriver.competition_id == competition.id).count()
-    )
-    judge_count = (
-        db.query(CompetitionJudge).filter(CompetitionJudge.competition_id == competition.id).count()
-    )
+def _competition_summary(
+    db: Session,
+    competition: Competition,
+    driver_count: Optional[int] = None,
+    judge_count: Optional[int] = None,
+) -> dict[str, Any]:
+    if driver_count is None:
+        driver_count = db.scalar(
+            select(func.count())
+            .select_from(CompetitionDriver)
+            .where(CompetitionDriver.competition_id == competition.id)
+        )
+    if judge_count is None:
+        judge_count = db.scalar(
+            select(func.count())
+            .select_from(CompetitionJudge)
+            .where(CompetitionJudge.competition_id == competition.id)
+        )
     return {
         "id": competition.id,
         "name": competition.name,
@@ -141,11 +213,16 @@ def create_classification(payload: GlobalClassificationCreate, db: Session = Dep
 
 
 @app.get("/classifications")
-def list_classifications(db: Session = Depends(get_db)):
-    rows = db.scalars(select(GlobalClassification).order_by(GlobalClassification.id.asc())).all()
+def list_classifications(conn: Connection = Depends(get_conn)):
+    stmt = select(
+        GlobalClassification.id,
+        GlobalClassification.name,
+        GlobalClassification.is_closed,
+        GlobalClassification.created_at,
+    ).order_by(GlobalClassification.id.asc())
     return [
-        {"id": c.id, "name": c.name, "is_closed": c.is_closed, "created_at": c.created_at}
-        for c in rows
+        {"id": id_, "name": name, "is_closed": is_closed, "created_at": created_at}
+        for id_, name, is_closed, created_at in conn.execute(stmt).yield_per(LIST_BATCH_SIZE)
     ]
 
 
@@ -157,7 +234,7 @@ def close_classification(classification_id: int, db: Session = Depends(get_db)):
     return {"id": cls.id, "name": cls.name, "is_closed": cls.is_closed}
 
 
-@app.get("/classifications/{classification_id}/standings")
+@app.get("/classifications/{classification_id}/standings", response_model=ClassificationStandingsOut)
 def classification_standings(classification_id: int, db: Session = Depends(get_db)):
     cls = get_classification_or_404(db, classification_id)
     return {
@@ -182,7 +259,20 @@ def create_competition(payload: CompetitionCreate, db: Session = Depends(get_db)
 @app.get("/competitions")
 def list_competitions(db: Session = Depends(get_db)):
     rows = db.scalars(select(Competition).order_by(Competition.id.asc())).all()
-    return [_competition_summary(db, c) for c in rows]
+    driver_counts = dict(
+        db.execute(
+            select(CompetitionDriver.competition_id, func.count()).group_by(CompetitionDriver.competition_id)
+        ).all()
+    )
+    judge_counts = dict(
+        db.execute(
+            select(CompetitionJudge.competition_id, func.count()).group_by(CompetitionJudge.competition_id)
+        ).all()
+    )
+    return [
+        _competition_summary(db, c, driver_counts.get(c.id, 0), judge_counts.get(c.id, 0))
+        for c in rows
+    ]
 
 
 @app.get("/competitions/{competition_id}")
@@ -204,9 +294,12 @@ def create_driver(payload: DriverCreate, db: Session = Depends(get_db)):
 
 
 @app.get("/drivers")
-def list_drivers(db: Session = Depends(get_db)):
-    rows = db.scalars(select(Driver).order_by(Driver.number.asc())).all()
-    return [{"id": d.id, "name": d.name, "number": d.number} for d in rows]
+def list_drivers(conn: Connection = Depends(get_conn)):
+    stmt = select(Driver.id, Driver.name, Driver.number).order_by(Driver.number.asc())
+    return [
+        {"id": id_, "name": name, "number": number}
+        for id_, name, number in conn.execute(stmt).yield_per(LIST_BATCH_SIZE)
+    ]
 
 
 @app.post("/judges")
@@ -222,54 +315,42 @@ def create_judge(payload: JudgeCreate, db: Session = Depends(get_db)):
 
 
 @app.get("/judges")
-def list_judges(db: Session = Depends(get_db)):
-    rows = db.scalars(select(Judge).order_by(Judge.id.asc())).all()
-    return [{"id": j.id, "name": j.name} for j in rows]
+def list_judges(conn: Connection = Depends(get_conn)):
+    stmt = select(Judge.id, Judge.name).order_by(Judge.id.asc())
+    return [{"id": id_, "name": name} for id_, name in conn.execute(stmt).yield_per(LIST_BATCH_SIZE)]
 
 
 @app.get("/competitions/{competition_id}/drivers")
 def list_competition_drivers(competition_id: int, db: Session = Depends(get_db)):
     get_competition_or_404(db, competition_id)
-    rows = db.scalars(
-        select(CompetitionDriver).where(CompetitionDriver.competition_id == competition_id)
+    rows = db.execute(
+        select(CompetitionDriver, Driver)
+        .join(Driver, Driver.id == CompetitionDriver.driver_id)
+        .where(CompetitionDriver.competition_id == competition_id)
+        .order_by(Driver.number.asc())
     ).all()
-    if not rows:
-        return []
-    driver_ids = [row.driver_id for row in rows]
-    drivers = {
-        d.id: d for d in db.scalars(select(Driver).where(Driver.id.in_(driver_ids))).all()
-    }
-    payload = []
-    for row in rows:
-        d = drivers.get(row.driver_id)
-        if not d:
-            continue
-        payload.append(
-            {
-                "id": d.id,
-                "name": d.name,
-                "number": d.number,
-                "group_name": row.group_name,
-                "qualifying_rank": row.qualifying_rank,
-            }
-        )
-    payload.sort(key=lambda item: item["number"])
-    return payload
+    return [
+        {
+            "id": d.id,
+            "name": d.name,
+            "number": d.number,
+            "group_name": entry.group_name,
+            "qualifying_rank": entry.qualifying_rank,
+        }
+        for entry, d in rows
+    ]
 
 
 @app.get("/competitions/{competition_id}/judges")
 def list_competition_judges(competition_id: int, db: Session = Depends(get_db)):
     get_competition_or_404(db, competition_id)
-    rows = db.scalars(
-        select(CompetitionJudge).where(CompetitionJudge.competition_id == competition_id)
+    judges = db.scalars(
+        select(Judge)
+        .join(CompetitionJudge, CompetitionJudge.judge_id == Judge.id)
+        .where(CompetitionJudge.competition_id == competition_id)
+        .order_by(Judge.name.asc(), Judge.id.asc())
     ).all()
-    if not rows:
-        return []
-    judge_ids = [row.judge_id for row in rows]
-    judges = db.scalars(select(Judge).where(Judge.id.in_(judge_ids))).all()
-    payload = [{"id": j.id, "name": j.name} for j in judges]
-    payload.sort(key=lambda item: (item["name"], item["id"]))
-    return payload
+    return [{"id": j.id, "name": j.name} for j in judges]
 
 
 @app.post("/competitions/{competition_id}/drivers")
@@ -285,23 +366,17 @@ def assign_drivers_to_competition(
     ids = sorted(set(payload.driver_ids))
     if not ids:
         raise HTTPException(status_code=400, detail="No driver IDs provided")
-    drivers = db.scalars(select(Driver).where(Driver.id.in_(ids))).all()
-    if len(drivers) != len(ids):
+    found_ids = db.scalars(select(Driver.id).where(Driver.id.in_(ids))).all()
+    if len(found_ids) != len(ids):
         raise HTTPException(status_code=400, detail="Some driver IDs do not exist")
 
-    existing_ids = {
-        row.driver_id
-        for row in db.scalars(
-            select(CompetitionDriver).where(CompetitionDriver.competition_id == competition_id)
-        ).all()
-    }
-    added = 0
-    for driver_id in ids:
-        if driver_id in existing_ids:
-            continue
-        db.add(CompetitionDriver(competition_id=competition_id, driver_id=driver_id))
-        added += 1
+    stmt = sqlite_insert(CompetitionDriver).values(
+        [{"competition_id": competition_id, "driver_id": driver_id} for driver_id in ids]
+    ).on_conflict_do_nothing(index_elements=["competition_id", "driver_id"])
+    added = db.execute(stmt).rowcount
+    invalidate_roster_cache(db, competition_id)
     db.commit()
+    hub.invalidate(competition_id)
     return {"competition_id": competition_id, "added_drivers": added}
 
 
@@ -318,27 +393,21 @@ def assign_judges_to_competition(
     ids = sorted(set(payload.judge_ids))
     if not ids:
         raise HTTPException(status_code=400, detail="No judge IDs provided")
-    judges = db.scalars(select(Judge).where(Judge.id.in_(ids))).all()
-    if len(judges) != len(ids):
+    found_ids = db.scalars(select(Judge.id).where(Judge.id.in_(ids))).all()
+    if len(found_ids) != len(ids):
         raise HTTPException(status_code=400, detail="Some judge IDs do not exist")
 
-    existing_ids = {
-        row.judge_id
-        for row in db.scalars(
-            select(CompetitionJudge).where(CompetitionJudge.competition_id == competition_id)
-        ).all()
-    }
-    added = 0
-    for judge_id in ids:
-        if judge_id in existing_ids:
-            continue
-        db.add(CompetitionJudge(competition_id=competition_id, judge_id=judge_id))
-        added += 1
+    stmt = sqlite_insert(CompetitionJudge).values(
+        [{"competition_id": competition_id, "judge_id": judge_id} for judge_id in ids]
+    ).on_conflict_do_nothing(index_elements=["competition_id", "judge_id"])
+    added = db.execute(stmt).rowcount
+    invalidate_roster_cache(db, competition_id)
     db.commit()
+    hub.invalidate(competition_id)
     return {"competition_id": competition_id, "added_judges": added}
 
 
-@app.post("/competitions/{competition_id}/qualifying/scores")
+@app.post("/competitions/{competition_id}/qualifying/scores", response_model=QualifyingLeaderboardOut)
 async def submit_qualifying_score(
     competition_id: int,
     payload: QualifyingScoreUpsert,
@@ -354,7 +423,8 @@ async def submit_qualifying_score(
     )
     db.commit()
 
-    leaderboard = qualifying_leaderboard(db, competition_id)
+    leaderboard = [row.as_dict() for row in qualifying_leaderboard(db, competition_id)]
+    hub.update_snapshot(competition_id, qualifying_leaderboard=leaderboard)
     await hub.broadcast(
         competition_id,
         {"type": "qualifying_leaderboard", "competition_id": competition_id, "leaderboard": leaderboard},
@@ -362,7 +432,7 @@ async def submit_qualifying_score(
     return {"competition_id": competition_id, "leaderboard": leaderboard}
 
 
-@app.get("/competitions/{competition_id}/qualifying/leaderboard")
+@app.get("/competitions/{competition_id}/qualifying/leaderboard", response_model=QualifyingLeaderboardOut)
 def get_qualifying_leaderboard(competition_id: int, db: Session = Depends(get_db)):
     return {
         "competition_id": competition_id,
@@ -374,6 +444,8 @@ def get_qualifying_leaderboard(competition_id: int, db: Session = Depends(get_db
 async def start_competition_tournament(competition_id: int, db: Session = Depends(get_db)):
     result = start_tournament(db, competition_id)
     db.commit()
+    # Qualifying ranks and groups are now set, so the cached standings are stale too.
+    hub.invalidate(competition_id)
 
     await hub.broadcast(
         competition_id,
@@ -387,7 +459,7 @@ async def start_competition_tournament(competition_id: int, db: Session = Depend
     return result
 
 
-@app.get("/competitions/{competition_id}/groups/{group_name}/standings")
+@app.get("/competitions/{competition_id}/groups/{group_name}/standings", response_model=GroupStandingsOut)
 def get_group_standings(competition_id: int, group_name: str, db: Session = Depends(get_db)):
     g = group_name.upper()
     if g not in {"A", "B"}:
@@ -395,24 +467,45 @@ def get_group_standings(competition_id: int, group_name: str, db: Session = Depe
     return {"competition_id": competition_id, "group": g, "standings": group_standings(db, competition_id, g)}
 
 
-@app.get("/competitions/{competition_id}/battles")
+@app.get("/competitions/{competition_id}/battles", response_model=CompetitionBattlesOut)
 def get_battles(
     competition_id: int,
     stage: Optional[str] = Query(default=None),
+    status: Optional[str] = Query(default=None),
     db: Session = Depends(get_db),
 ):
     return {
         "competition_id": competition_id,
-        "battles": list_competition_battles(db, competition_id, stage=stage),
+        "battles": list_competition_battles(db, competition_id, stage=stage, status=status),
     }
 
 
-@app.get("/battles/{battle_id}")
+@app.get("/battles/{battle_id}", response_model=BattleResultOut)
 def get_battle(battle_id: int, db: Session = Depends(get_db)):
     battle = get_battle_or_404(db, battle_id)
     return battle_state(db, battle)
 
 
+def _battle_update_payload(competition_id: int, battle_id: int) -> dict[str, Any]:
+    with SessionLocal() as db:
+        battle = db.scalar(
+            select(Battle).options(joinedload(Battle.competition)).where(Battle.id == battle_id)
+        )
+        competition = battle.competition
+        payload_out: dict[str, Any] = {
+            "type": "battle_update",
+            "competition_id": competition_id,
+            "battle": battle_state(db, battle),
+            "battles": list_competition_battles(db, competition_id),
+            "competition_status": competition.status,
+        }
+        if competition.status == "completed":
+            payload_out["competition_standings"] = competition_driver_standings(db, competition_id)
+            hub.update_snapshot(competition_id, competition_standings=payload_out["competition_standings"])
+    hub.update_snapshot(competition_id, battles=payload_out["battles"])
+    return payload_out
+
+
 @app.post("/battles/{battle_id}/scores")
 async def submit_battle_score(
     battle_id: int,
@@ -430,20 +523,9 @@ async def submit_battle_score(
     )
     db.commit()
 
-    battle = get_battle_or_404(db, battle_id)
-    competition_id = battle.competition_id
-    competition = get_competition_or_404(db, competition_id)
-    payload_out: dict[str, Any] = {
-        "type": "battle_update",
-        "competition_id": competition_id,
-        "battle": battle_state(db, battle),
-        "battles": list_competition_battles(db, competition_id),
-        "competition_status": competition.status,
-    }
-    if competition.status == "completed":
-        payload_out["competition_standings"] = competition_driver_standings(db, competition_id)
-
-    await hub.broadcast(competition_id, payload_out)
+    # Still in the identity map after commit (expire_on_commit=False), so no SELECT here.
+    competition_id = get_battle_or_404(db, battle_id).competition_id
+    hub.mark_dirty(competition_id, lambda: _battle_update_payload(competition_id, battle_id))
     return result
 
 
@@ -451,10 +533,11 @@ async def submit_battle_score(
 def manual_progress(competition_id: int, db: Session = Depends(get_db)):
     result = try_progress_competition(db, competition_id)
     db.commit()
+    hub.invalidate(competition_id)
     return result
 
 
-@app.get("/competitions/{competition_id}/standings")
+@app.get("/competitions/{competition_id}/standings", response_model=CompetitionStandingsOut)
 def get_competition_standings(competition_id: int, db: Session = Depends(get_db)):
     comp = get_competition_or_404(db, competition_id)
     return {
@@ -466,19 +549,21 @@ def get_competition_standings(competition_id: int, db: Session = Depends(get_db)
 
 
 @app.websocket("/ws/competitions/{competition_id}/leaderboard")
-async def competition_updates_ws(websocket: WebSocket, competition_id: int, db: Session = Depends(get_db)):
-    get_competition_or_404(db, competition_id)
-    await hub.connect(competition_id, websocket)
-    try:
-        await websocket.send_json(
-            {
-                "type": "bootstrap",
-                "competition_id": competition_id,
-                "qualifying_leaderboard": qualifying_leaderboard(db, competition_id),
+async def competition_updates_ws(websocket: WebSocket, competition_id: int):
+    # The session only lives for the bootstrap; idle sockets must not pin a DB connection.
+    with SessionLocal() as db:
+        get_competition_or_404(db, competition_id)
+        await hub.connect(competition_id, websocket)
+        snapshot = hub.snapshot(competition_id)
+        if snapshot is None:
+            snapshot = {
+                "qualifying_leaderboard": [row.as_dict() for row in qualifying_leaderboard(db, competition_id)],
                 "battles": list_competition_battles(db, competition_id),
                 "competition_standings": competition_driver_standings(db, competition_id),
             }
-        )
+            hub.store_snapshot(competition_id, snapshot)
+    try:
+        await websocket.send_json({"type": "bootstrap", "competition_id": competition_id, **snapshot})
         while True:
             await websocket.receive_text()
     except WebSocketDisconnect:
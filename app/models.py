@@ -7,6 +7,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
@@ -144,6 +145,9 @@ class QualifyingScore(Base):
             "run_number",
             name="uq_qualifying_score",
         ),
+        # Serves the leaderboard's GROUP BY (driver, run). Score is deliberately left out so
+        # each group is still averaged in insertion order, keeping half-cent rounding stable.
+        Index("ix_qualifying_comp_driver_run", "competition_id", "driver_id", "run_number"),
     )
 
 
@@ -169,6 +173,8 @@ class Battle(Base):
         "BattleRunScore", back_populates="battle", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (Index("ix_battle_comp_stage", "competition_id", "stage", "order_index"),)
+
 
 class BattleRunScore(Base):
     __tablename__ = "battle_run_scores"
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from itertools import combinations
 from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
@@ -9,7 +10,7 @@ Pair = Tuple[int, int]
 SCORE_DECIMALS = 2
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RoundResolution:
     winner_slot: Optional[int]
     driver1_round_score: float
@@ -21,18 +22,20 @@ def assign_groups_alternating(ordered_driver_ids: Sequence[int]) -> Dict[str, Li
     Assign drivers to Group A/B in alternating qualifying order.
     Rank 1 -> A, Rank 2 -> B, Rank 3 -> A, ...
     """
-    groups = {"A": [], "B": []}
-    for idx, driver_id in enumerate(ordered_driver_ids):
-        target = "A" if idx % 2 == 0 else "B"
-        groups[target].append(driver_id)
-    return groups
+    ids = list(ordered_driver_ids)
+    return {"A": ids[0::2], "B": ids[1::2]}
+
+
+@lru_cache(maxsize=64)
+def _round_robin_template(size: int) -> Tuple[Pair, ...]:
+    return tuple(combinations(range(size), 2))
 
 
 def build_round_robin_pairs(driver_ids: Sequence[int]) -> List[Pair]:
     """
     Generate all unique in-group battles (round robin).
     """
-    return [(a, b) for a, b in combinations(driver_ids, 2)]
+    return [(driver_ids[a], driver_ids[b]) for a, b in _round_robin_template(len(driver_ids))]
 
 
 def order_battles_avoid_consecutive(pairs: Sequence[Pair]) -> List[Pair]:
@@ -40,27 +43,27 @@ def order_battles_avoid_consecutive(pairs: Sequence[Pair]) -> List[Pair]:
     Greedy ordering that avoids consecutive appearances when possible.
     If no perfect candidate exists, picks the pair with least overlap.
     """
-    remaining: List[Pair] = list(pairs)
+    # Sorted once up front, so the first candidate found with a given overlap
+    # is also the lowest (driver1, driver2) tie-break among them.
+    remaining: List[Pair] = sorted(pairs)
     if not remaining:
         return []
 
     ordered: List[Pair] = []
-    last_drivers: set[int] = set()
+    last_drivers: Tuple[int, ...] = ()
 
     while remaining:
-        # Prefer a pair with zero overlap vs. previous battle.
-        ranked = sorted(
-            enumerate(remaining),
-            key=lambda item: (
-                len(set(item[1]).intersection(last_drivers)),
-                item[1][0],
-                item[1][1],
-            ),
-        )
-        best_idx = ranked[0][0]
+        best_idx = 0
+        best_overlap = 3
+        for idx, (a, b) in enumerate(remaining):
+            overlap = (a in last_drivers) + (b in last_drivers)
+            if overlap < best_overlap:
+                best_idx, best_overlap = idx, overlap
+                if overlap == 0:
+                    break
         chosen = remaining.pop(best_idx)
         ordered.append(chosen)
-        last_drivers = {chosen[0], chosen[1]}
+        last_drivers = chosen
 
     return ordered
 
@@ -79,45 +82,25 @@ def resolve_two_run_round(
     driver2_round = round_score((run1_driver2_avg + run2_driver2_avg) / 2.0)
 
     if abs(driver1_round - driver2_round) < 1e-9:
-        return RoundResolution(
-            winner_slot=None,
-            driver1_round_score=driver1_round,
-            driver2_round_score=driver2_round,
-        )
+        return RoundResolution(None, driver1_round, driver2_round)
+    return RoundResolution(1 if driver1_round > driver2_round else 2, driver1_round, driver2_round)
+
 
-    winner_slot = 1 if driver1_round > driver2_round else 2
-    return RoundResolution(
-        winner_slot=winner_slot,
-        driver1_round_score=driver1_round,
-        driver2_round_score=driver2_round,
-    )
+# Index = finishing place; places outside the table score 0.
+_PLACE_POINTS: Tuple[int, ...] = (0, 100, 88, 76, 64) + (48,) * 4 + (32,) * 8 + (16,) * 16
+# Index = qualifying rank; only the top 3 earn a bonus.
+_QUALIFYING_BONUS: Tuple[int, ...] = (0, 3, 2, 1)
 
 
 def competition_points_for_place(place: int) -> int:
-    if place == 1:
-        return 100
-    if place == 2:
-        return 88
-    if place == 3:
-        return 76
-    if place == 4:
-        return 64
-    if 5 <= place <= 8:
-        return 48
-    if 9 <= place <= 16:
-        return 32
-    if 17 <= place <= 32:
-        return 16
+    if 1 <= place < len(_PLACE_POINTS):
+        return _PLACE_POINTS[place]
     return 0
 
 
 def qualifying_bonus_for_rank(rank: int) -> int:
-    if rank == 1:
-        return 3
-    if rank == 2:
-        return 2
-    if rank == 3:
-        return 1
+    if 1 <= rank < len(_QUALIFYING_BONUS):
+        return _QUALIFYING_BONUS[rank]
     return 0
 
 
@@ -134,7 +117,7 @@ def total_after_drop_lowest_once(scores: Sequence[float]) -> float:
 
 
 def average(values: Iterable[float]) -> float:
-    vals = list(values)
+    vals = values if isinstance(values, (list, tuple)) else list(values)
     if not vals:
         return 0.0
     return float(sum(vals) / len(vals))
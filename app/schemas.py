@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class GlobalClassificationCreate(BaseModel):
@@ -47,6 +47,8 @@ class BattleRunScoreUpsert(BaseModel):
 
 
 class BattleResultOut(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: int
     stage: str
     group_name: Optional[str] = None
@@ -61,6 +63,8 @@ class BattleResultOut(BaseModel):
 
 
 class CompetitionDriverStandingOut(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     driver_id: int
     driver_name: str
     driver_number: int
@@ -71,3 +75,94 @@ class CompetitionDriverStandingOut(BaseModel):
     competition_points: float
     qualifying_points: float
     total_points: float
+
+
+class CompetitionBattlesOut(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    competition_id: int
+    battles: list[BattleResultOut]
+
+
+class CompetitionStandingsOut(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    competition_id: int
+    competition_name: str
+    status: str
+    standings: list[CompetitionDriverStandingOut]
+
+
+class QualifyingLeaderboardRowOut(BaseModel):
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
+    driver_id: int
+    driver_name: str
+    driver_number: int
+    run1_avg: float
+    run2_avg: float
+    qualifying_score: float
+    second_best_run: float
+    is_complete: bool
+    rank: int
+
+
+class QualifyingLeaderboardOut(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    competition_id: int
+    leaderboard: list[QualifyingLeaderboardRowOut]
+
+
+class GroupStandingRowOut(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    driver_id: int
+    driver_name: str
+    driver_number: int
+    wins: int
+    losses: int
+    points_for: float
+    points_against: float
+    qualifying_rank: int
+    rank: int
+    point_diff: float
+
+
+class GroupStandingsOut(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    competition_id: int
+    group: str
+    standings: list[GroupStandingRowOut]
+
+
+class CompetitionBreakdownOut(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    competition_id: int
+    points: float
+    place: Optional[int] = None
+
+
+class ClassificationStandingRowOut(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    driver_id: int
+    driver_name: str
+    driver_number: int
+    competitions_count: int
+    raw_total_points: float
+    effective_total_points: float
+    drop_lowest_applied: bool
+    competition_breakdown: list[CompetitionBreakdownOut]
+    rank: int
+
+
+class ClassificationStandingsOut(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    classification_id: int
+    classification_name: str
+    is_closed: bool
+    standings: list[ClassificationStandingRowOut]
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from collections import defaultdict
 from dataclasses import dataclass
+from operator import itemgetter
 from typing import Any, Dict, Iterable, List, Optional
 
 from fastapi import HTTPException
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, event, func, inspect, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, selectinload
 
 from app.models import (
     Battle,
@@ -21,7 +23,6 @@ from app.models import (
 )
 from app.rules import (
     assign_groups_alternating,
-    average,
     build_round_robin_pairs,
     competition_points_for_place,
     order_battles_avoid_consecutive,
@@ -70,14 +71,45 @@ def competition_judge_ids(db: Session, competition_id: int) -> set[int]:
     return set(rows)
 
 
-def upsert_qualifying_score(
-    db: Session,
-    competition_id: int,
-    driver_id: int,
-    judge_id: int,
-    run_number: int,
-    score: float,
-) -> QualifyingScore:
+# Roster lookups repeat many times per request (every score submission validates
+# against them), so they are memoized in ``db.info``. The caches are dropped on
+# commit/rollback and when an assignment endpoint changes the roster; the
+# leaderboard cache is also dropped whenever a qualifying score is written, and
+# the group standings cache whenever a battle score is written.
+_DRIVER_IDS_CACHE = "competition_driver_ids"
+_JUDGE_IDS_CACHE = "competition_judge_ids"
+_LEADERBOARD_CACHE = "qualifying_leaderboard"
+_GROUP_STANDINGS_CACHE = "group_standings"
+_SESSION_CACHES = (_DRIVER_IDS_CACHE, _JUDGE_IDS_CACHE, _LEADERBOARD_CACHE, _GROUP_STANDINGS_CACHE)
+
+
+def _driver_ids_cached(db: Session, competition_id: int) -> set[int]:
+    cache = db.info.setdefault(_DRIVER_IDS_CACHE, {})
+    if competition_id not in cache:
+        cache[competition_id] = competition_driver_ids(db, competition_id)
+    return cache[competition_id]
+
+
+def _judge_ids_cached(db: Session, competition_id: int) -> set[int]:
+    cache = db.info.setdefault(_JUDGE_IDS_CACHE, {})
+    if competition_id not in cache:
+        cache[competition_id] = competition_judge_ids(db, competition_id)
+    return cache[competition_id]
+
+
+def invalidate_roster_cache(db: Session, competition_id: int) -> None:
+    for key in _SESSION_CACHES:
+        db.info.get(key, {}).pop(competition_id, None)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_session_caches(session: Session) -> None:
+    for key in _SESSION_CACHES:
+        session.info.pop(key, None)
+
+
+def _require_qualifying_open(db: Session, competition_id: int) -> None:
     competition = get_competition_or_404(db, competition_id)
     if competition.status != "qualifying":
         raise HTTPException(
@@ -85,14 +117,27 @@ def upsert_qualifying_score(
             detail="Qualifying scores can only be submitted before tournament starts",
         )
 
-    driver_ids = competition_driver_ids(db, competition_id)
-    if driver_id not in driver_ids:
+
+def _require_qualifying_roster(db: Session, competition_id: int, driver_id: int, judge_id: int) -> None:
+    if driver_id not in _driver_ids_cached(db, competition_id):
         raise HTTPException(status_code=400, detail="Driver is not registered in this competition")
-    judge_ids = competition_judge_ids(db, competition_id)
-    if judge_id not in judge_ids:
+    if judge_id not in _judge_ids_cached(db, competition_id):
         raise HTTPException(status_code=400, detail="Judge is not assigned to this competition")
 
+
+def upsert_qualifying_score(
+    db: Session,
+    competition_id: int,
+    driver_id: int,
+    judge_id: int,
+    run_number: int,
+    score: float,
+) -> QualifyingScore:
+    _require_qualifying_open(db, competition_id)
+    _require_qualifying_roster(db, competition_id, driver_id, judge_id)
+
     score = round_score(score)
+    db.info.get(_LEADERBOARD_CACHE, {}).pop(competition_id, None)
 
     existing = db.scalar(
         select(QualifyingScore).where(
@@ -117,91 +162,173 @@ def upsert_qualifying_score(
     return created
 
 
-def qualifying_leaderboard(db: Session, competition_id: int) -> list[dict[str, Any]]:
-    competition = get_competition_or_404(db, competition_id)
-    driver_entries = db.scalars(
-        select(CompetitionDriver).where(CompetitionDriver.competition_id == competition.id)
-    ).all()
-    judge_count = len(competition_judge_ids(db, competition_id))
-
-    driver_map = {entry.driver_id: entry for entry in driver_entries}
-    driver_ids = list(driver_map.keys())
-    if not driver_ids:
-        return []
+def upsert_qualifying_scores(
+    db: Session,
+    competition_id: int,
+    rows: Iterable[tuple[int, int, int, float]],
+) -> int:
+    # Rows are (driver_id, judge_id, run_number, score), written in one INSERT .. ON CONFLICT.
+    # This bypasses the unit of work, so already-loaded QualifyingScore objects are not refreshed.
+    _require_qualifying_open(db, competition_id)
+    values = []
+    for driver_id, judge_id, run_number, score in rows:
+        _require_qualifying_roster(db, competition_id, driver_id, judge_id)
+        values.append(
+            {
+                "competition_id": competition_id,
+                "driver_id": driver_id,
+                "judge_id": judge_id,
+                "run_number": run_number,
+                "score": round_score(score),
+            }
+        )
+    if not values:
+        return 0
+
+    db.info.get(_LEADERBOARD_CACHE, {}).pop(competition_id, None)
+    stmt = sqlite_insert(QualifyingScore).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            QualifyingScore.competition_id,
+            QualifyingScore.driver_id,
+            QualifyingScore.judge_id,
+            QualifyingScore.run_number,
+        ],
+        set_={"score": stmt.excluded.score},
+    )
+    db.execute(stmt)
+    return len(values)
+
+
+@dataclass(slots=True)
+class QualifyingRow:
+    driver_id: int
+    driver_name: str
+    driver_number: int
+    run1_avg: float
+    run2_avg: float
+    qualifying_score: float
+    second_best_run: float
+    is_complete: bool
+    rank: int = 0
+
+    # Rows still read like the dicts they replaced (row["driver_id"]).
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "driver_id": self.driver_id,
+            "driver_name": self.driver_name,
+            "driver_number": self.driver_number,
+            "run1_avg": self.run1_avg,
+            "run2_avg": self.run2_avg,
+            "qualifying_score": self.qualifying_score,
+            "second_best_run": self.second_best_run,
+            "is_complete": self.is_complete,
+            "rank": self.rank,
+        }
 
-    drivers = {
-        d.id: d
-        for d in db.scalars(select(Driver).where(Driver.id.in_(driver_ids))).all()
-    }
 
-    score_rows = db.scalars(
-        select(QualifyingScore).where(QualifyingScore.competition_id == competition_id)
+def qualifying_leaderboard(db: Session, competition_id: int) -> list[QualifyingRow]:
+    competition = get_competition_or_404(db, competition_id)
+    cache = db.info.setdefault(_LEADERBOARD_CACHE, {})
+    if competition_id in cache:
+        return cache[competition_id]
+
+    # Per-run averages and judge counts are pivoted by SQLite into one row per driver
+    # and joined onto the roster, so the whole board comes back in a single query.
+    run1 = QualifyingScore.run_number == 1
+    run2 = QualifyingScore.run_number == 2
+    run_stats = (
+        select(
+            QualifyingScore.driver_id,
+            func.avg(case((run1, QualifyingScore.score))).label("run1_avg"),
+            func.count(case((run1, QualifyingScore.score))).label("run1_count"),
+            func.avg(case((run2, QualifyingScore.score))).label("run2_avg"),
+            func.count(case((run2, QualifyingScore.score))).label("run2_count"),
+        )
+        .where(QualifyingScore.competition_id == competition_id)
+        .group_by(QualifyingScore.driver_id)
+        .subquery()
+    )
+    drivers = db.execute(
+        select(
+            Driver.id,
+            Driver.name,
+            Driver.number,
+            run_stats.c.run1_avg,
+            run_stats.c.run1_count,
+            run_stats.c.run2_avg,
+            run_stats.c.run2_count,
+        )
+        .join(CompetitionDriver, CompetitionDriver.driver_id == Driver.id)
+        .outerjoin(run_stats, run_stats.c.driver_id == Driver.id)
+        .where(CompetitionDriver.competition_id == competition.id)
     ).all()
-
-    run_scores: dict[int, dict[int, list[float]]] = defaultdict(lambda: defaultdict(list))
-    for row in score_rows:
-        run_scores[row.driver_id][row.run_number].append(row.score)
-
-    items: list[dict[str, Any]] = []
-    for driver_id in driver_ids:
-        d = drivers[driver_id]
-        run1_values = run_scores[driver_id][1]
-        run2_values = run_scores[driver_id][2]
-        run1_avg = round_score(average(run1_values)) if run1_values else 0.0
-        run2_avg = round_score(average(run2_values)) if run2_values else 0.0
-        present_avgs = [
-            v
-            for v in [run1_avg if run1_values else None, run2_avg if run2_values else None]
-            if v is not None
-        ]
+    if not drivers:
+        return []
+    judge_count = len(_judge_ids_cached(db, competition_id))
+
+    # Sort keys are built once per driver alongside the row, not per comparison.
+    keyed: list[tuple[tuple[float, float, float, float, int], QualifyingRow]] = []
+    for driver_id, driver_name, driver_number, run1_raw, run1_count, run2_raw, run2_count in drivers:
+        run1_count = run1_count or 0
+        run2_count = run2_count or 0
+        run1_avg = round_score(run1_raw) if run1_count else 0.0
+        run2_avg = round_score(run2_raw) if run2_count else 0.0
         # Qualifying result is the best run out of the two runs.
-        total = max(present_avgs) if present_avgs else 0.0
-        second_best = min(present_avgs) if len(present_avgs) == 2 else 0.0
+        if run1_count and run2_count:
+            if run1_avg >= run2_avg:
+                total, second_best = run1_avg, run2_avg
+            else:
+                total, second_best = run2_avg, run1_avg
+        elif run1_count:
+            total, second_best = run1_avg, 0.0
+        elif run2_count:
+            total, second_best = run2_avg, 0.0
+        else:
+            total = second_best = 0.0
 
         is_complete = (
             judge_count > 0
-            and len(run1_values) == judge_count
-            and len(run2_values) == judge_count
+            and run1_count == judge_count
+            and run2_count == judge_count
         )
-        items.append(
-            {
-                "driver_id": driver_id,
-                "driver_name": d.name,
-                "driver_number": d.number,
-                "run1_avg": round_score(run1_avg),
-                "run2_avg": round_score(run2_avg),
-                "qualifying_score": round_score(total),
-                "second_best_run": round_score(second_best),
-                "is_complete": is_complete,
-            }
+        # Run averages are rounded above; the best/second-best values are picked from them.
+        item = QualifyingRow(
+            driver_id, driver_name, driver_number, run1_avg, run2_avg, total, second_best, is_complete
         )
+        sort_key = (-total, -second_best, -run2_avg, -run1_avg, driver_number)
+        keyed.append((sort_key, item))
 
-    items.sort(
-        key=lambda x: (
-            -x["qualifying_score"],
-            -x["second_best_run"],
-            -x["run2_avg"],
-            -x["run1_avg"],
-            x["driver_number"],
-        )
-    )
+    keyed.sort(key=itemgetter(0))
+    items = [item for _, item in keyed]
     for idx, row in enumerate(items, start=1):
-        row["rank"] = idx
+        row.rank = idx
+    cache[competition_id] = items
     return items
 
 
 def qualifying_is_complete(db: Session, competition_id: int) -> bool:
-    competition = get_competition_or_404(db, competition_id)
-    judge_ids = competition_judge_ids(db, competition_id)
-    if not judge_ids:
+    get_competition_or_404(db, competition_id)
+    judge_count = len(_judge_ids_cached(db, competition_id))
+    if not judge_count:
         return False
-    entries = db.scalars(
-        select(CompetitionDriver).where(CompetitionDriver.competition_id == competition.id)
-    ).all()
-    if not entries:
+    driver_count = len(_driver_ids_cached(db, competition_id))
+    if not driver_count:
         return False
-    lb = qualifying_leaderboard(db, competition_id)
-    return all(item["is_complete"] for item in lb)
+    # Complete when every (driver, run) pair has a score from every judge.
+    complete_runs = db.scalar(
+        select(func.count()).select_from(
+            select(QualifyingScore.driver_id, QualifyingScore.run_number)
+            .where(QualifyingScore.competition_id == competition_id)
+            .group_by(QualifyingScore.driver_id, QualifyingScore.run_number)
+            .having(func.count(QualifyingScore.score) == judge_count)
+            .subquery()
+        )
+    )
+    return complete_runs == 2 * driver_count
 
 
 def start_tournament(db: Session, competition_id: int) -> dict[str, Any]:
@@ -217,10 +344,10 @@ def start_tournament(db: Session, competition_id: int) -> dict[str, Any]:
             status_code=400,
             detail="At least 4 drivers are required to start tournament",
         )
-    if not all(row["is_complete"] for row in lb):
+    if not all(row.is_complete for row in lb):
         raise HTTPException(status_code=400, detail="Qualifying is not complete")
 
-    ordered_driver_ids = [row["driver_id"] for row in lb]
+    ordered_driver_ids = [row.driver_id for row in lb]
     groups = assign_groups_alternating(ordered_driver_ids)
     if len(groups["A"]) < 2 or len(groups["B"]) < 2:
         raise HTTPException(
@@ -233,19 +360,21 @@ def start_tournament(db: Session, competition_id: int) -> dict[str, Any]:
     ).all()
     entry_by_driver = {e.driver_id: e for e in entries}
 
+    db.info.get(_GROUP_STANDINGS_CACHE, {}).pop(competition_id, None)
+    group_a_set = set(groups["A"])
     for rank, row in enumerate(lb, start=1):
-        entry = entry_by_driver[row["driver_id"]]
+        entry = entry_by_driver[row.driver_id]
         entry.qualifying_rank = rank
-        entry.qualifying_score = row["qualifying_score"]
-        entry.group_name = "A" if row["driver_id"] in groups["A"] else "B"
+        entry.qualifying_score = row.qualifying_score
+        entry.group_name = "A" if row.driver_id in group_a_set else "B"
 
     # Build group battles with best-effort non-consecutive order.
-    created_battles = 0
+    battles: list[Battle] = []
     for group_name in ["A", "B"]:
         pairs = build_round_robin_pairs(groups[group_name])
         ordered_pairs = order_battles_avoid_consecutive(pairs)
         for idx, (driver1_id, driver2_id) in enumerate(ordered_pairs, start=1):
-            db.add(
+            battles.append(
                 Battle(
                     competition_id=competition_id,
                     stage="group",
@@ -255,20 +384,38 @@ def start_tournament(db: Session, competition_id: int) -> dict[str, Any]:
                     driver2_id=driver2_id,
                 )
             )
-            created_battles += 1
+    db.add_all(battles)
 
     competition.status = "tournament"
-    return {"groups": groups, "created_group_battles": created_battles}
+    return {"groups": groups, "created_group_battles": len(battles)}
 
 
-def battle_current_omt_round(db: Session, battle_id: int) -> int:
+def battle_current_omt_round(
+    db: Session, battle_id: int, preloaded: Optional[dict[int, list[Any]]] = None
+) -> int:
+    if preloaded is not None:
+        return max((row.omt_round for row in preloaded.get(battle_id, ())), default=0)
     value = db.scalar(
         select(func.max(BattleRunScore.omt_round)).where(BattleRunScore.battle_id == battle_id)
     )
     return int(value) if value is not None else 0
 
 
-@dataclass
+def _loaded_run_scores(battle: Battle) -> Optional[list[BattleRunScore]]:
+    # Only use the collection when it was eager-loaded; never trigger a lazy load here.
+    if "run_scores" in inspect(battle).unloaded:
+        return None
+    return battle.run_scores
+
+
+def _current_omt_round(db: Session, battle: Battle) -> int:
+    loaded = _loaded_run_scores(battle)
+    if loaded is None:
+        return battle_current_omt_round(db, battle.id)
+    return battle_current_omt_round(db, battle.id, {battle.id: loaded})
+
+
+@dataclass(slots=True)
 class RoundAverages:
     run1_driver1: float
     run1_driver2: float
@@ -277,42 +424,61 @@ class RoundAverages:
     complete: bool
 
 
-def _round_averages(db: Session, battle: Battle, omt_round: int) -> RoundAverages:
-    rows = db.scalars(
-        select(BattleRunScore).where(
-            BattleRunScore.battle_id == battle.id,
-            BattleRunScore.omt_round == omt_round,
-        )
-    ).all()
+def _round_averages(
+    db: Session, battle: Battle, omt_round: int, judges_needed: Optional[int] = None
+) -> RoundAverages:
+    loaded = _loaded_run_scores(battle)
+    if loaded is not None:
+        rows = [r for r in loaded if r.omt_round == omt_round]
+    else:
+        # Only the columns the averaging needs; no ORM instances are built.
+        rows = db.execute(
+            select(
+                BattleRunScore.run_number,
+                BattleRunScore.driver1_points,
+                BattleRunScore.driver2_points,
+            ).where(
+                BattleRunScore.battle_id == battle.id,
+                BattleRunScore.omt_round == omt_round,
+            )
+        ).all()
     if not rows:
         return RoundAverages(0.0, 0.0, 0.0, 0.0, False)
 
-    judges_needed = len(competition_judge_ids(db, battle.competition_id))
-    run_map: dict[int, list[BattleRunScore]] = defaultdict(list)
-    for row in rows:
-        run_map[row.run_number].append(row)
+    if judges_needed is None:
+        judges_needed = len(_judge_ids_cached(db, battle.competition_id))
+    return _averages_from_rows(rows, judges_needed)
+
 
-    run1_rows = run_map.get(1, [])
-    run2_rows = run_map.get(2, [])
-    if len(run1_rows) != judges_needed or len(run2_rows) != judges_needed:
+def _averages_from_rows(rows: Any, judges_needed: int) -> RoundAverages:
+    # Single pass accumulating all four per-run totals.
+    run1_count = run2_count = 0
+    run1_driver1 = run1_driver2 = run2_driver1 = run2_driver2 = 0.0
+    for row in rows:
+        if row.run_number == 1:
+            run1_count += 1
+            run1_driver1 += row.driver1_points
+            run1_driver2 += row.driver2_points
+        elif row.run_number == 2:
+            run2_count += 1
+            run2_driver1 += row.driver1_points
+            run2_driver2 += row.driver2_points
+
+    if run1_count != judges_needed or run2_count != judges_needed:
         return RoundAverages(0.0, 0.0, 0.0, 0.0, False)
 
-    run1_driver1 = average(r.driver1_points for r in run1_rows)
-    run1_driver2 = average(r.driver2_points for r in run1_rows)
-    run2_driver1 = average(r.driver1_points for r in run2_rows)
-    run2_driver2 = average(r.driver2_points for r in run2_rows)
     return RoundAverages(
-        run1_driver1=run1_driver1,
-        run1_driver2=run1_driver2,
-        run2_driver1=run2_driver1,
-        run2_driver2=run2_driver2,
+        run1_driver1=run1_driver1 / run1_count,
+        run1_driver2=run1_driver2 / run1_count,
+        run2_driver1=run2_driver1 / run2_count,
+        run2_driver2=run2_driver2 / run2_count,
         complete=True,
     )
 
 
-def battle_state(db: Session, battle: Battle) -> dict[str, Any]:
-    current_round = battle_current_omt_round(db, battle.id)
-    round_data = _round_averages(db, battle, current_round)
+def battle_state(db: Session, battle: Battle, judges_needed: Optional[int] = None) -> dict[str, Any]:
+    current_round = _current_omt_round(db, battle)
+    round_data = _round_averages(db, battle, current_round, judges_needed)
 
     next_round = current_round
     if round_data.complete and battle.status != "completed":
@@ -340,48 +506,24 @@ def battle_state(db: Session, battle: Battle) -> dict[str, Any]:
     }
 
 
-def _all_battles_completed(
-    db: Session, competition_id: int, stage: str, group_name: Optional[str] = None
-) -> bool:
-    conditions = [Battle.competition_id == competition_id, Battle.stage == stage]
+def _all_battles_completed(battles: list[Battle], group_name: Optional[str] = None) -> bool:
     if group_name is not None:
-        conditions.append(Battle.group_name == group_name)
-    rows = db.scalars(select(Battle).where(*conditions)).all()
-    if not rows:
-        return False
-    return all(r.status == "completed" for r in rows)
+        battles = [b for b in battles if b.group_name == group_name]
+    return bool(battles) and all(b.status == "completed" for b in battles)
 
 
-def _has_stage(db: Session, competition_id: int, stage: str) -> bool:
-    return (
-        db.scalar(
-            select(func.count(Battle.id)).where(
-                Battle.competition_id == competition_id, Battle.stage == stage
-            )
-        )
-        or 0
-    ) > 0
-
-
-def _battle_decisive_round_scores(db: Session, battle: Battle) -> tuple[float, float]:
-    if battle.status != "completed":
-        return 0.0, 0.0
-    current_round = battle_current_omt_round(db, battle.id)
-    round_data = _round_averages(db, battle, current_round)
-    if not round_data.complete:
-        return 0.0, 0.0
-    resolution = resolve_two_run_round(
-        round_data.run1_driver1,
-        round_data.run1_driver2,
-        round_data.run2_driver1,
-        round_data.run2_driver2,
-    )
-    return resolution.driver1_round_score, resolution.driver2_round_score
+def group_standings(db: Session, competition_id: int, group_name: str) -> list[dict[str, Any]]:
+    cache = db.info.setdefault(_GROUP_STANDINGS_CACHE, {}).setdefault(competition_id, {})
+    if group_name not in cache:
+        cache[group_name] = _compute_group_standings(db, competition_id, group_name)
+    return cache[group_name]
 
 
-def group_standings(db: Session, competition_id: int, group_name: str) -> list[dict[str, Any]]:
-    entries = db.scalars(
-        select(CompetitionDriver).where(
+def _compute_group_standings(db: Session, competition_id: int, group_name: str) -> list[dict[str, Any]]:
+    entries = db.execute(
+        select(CompetitionDriver, Driver)
+        .join(Driver, Driver.id == CompetitionDriver.driver_id)
+        .where(
             CompetitionDriver.competition_id == competition_id,
             CompetitionDriver.group_name == group_name,
         )
@@ -389,10 +531,8 @@ def group_standings(db: Session, competition_id: int, group_name: str) -> list[d
     if not entries:
         return []
 
-    drivers = {d.id: d for d in db.scalars(select(Driver).where(Driver.id.in_([e.driver_id for e in entries]))).all()}
     stats: dict[int, dict[str, Any]] = {}
-    for entry in entries:
-        d = drivers[entry.driver_id]
+    for entry, d in entries:
         stats[entry.driver_id] = {
             "driver_id": entry.driver_id,
             "driver_name": d.name,
@@ -409,19 +549,55 @@ def group_standings(db: Session, competition_id: int, group_name: str) -> list[d
             Battle.competition_id == competition_id,
             Battle.stage == "group",
             Battle.group_name == group_name,
+            Battle.status == "completed",
         )
     ).all()
+    if not battles:
+        return _rank_group(stats)
+
+    # One query for every completed battle's scores, bucketed per battle.
+    score_rows = db.execute(
+        select(
+            BattleRunScore.battle_id,
+            BattleRunScore.omt_round,
+            BattleRunScore.run_number,
+            BattleRunScore.driver1_points,
+            BattleRunScore.driver2_points,
+        ).where(BattleRunScore.battle_id.in_([b.id for b in battles]))
+    ).all()
+    scores_by_battle: dict[int, list[Any]] = defaultdict(list)
+    for row in score_rows:
+        scores_by_battle[row.battle_id].append(row)
+
+    judges_needed = len(_judge_ids_cached(db, competition_id))
     for battle in battles:
-        if battle.status != "completed" or not battle.winner_id or not battle.loser_id:
+        if not battle.winner_id or not battle.loser_id:
             continue
         stats[battle.winner_id]["wins"] += 1
         stats[battle.loser_id]["losses"] += 1
-        d1_score, d2_score = _battle_decisive_round_scores(db, battle)
+        d1_score = d2_score = 0.0
+        current_round = battle_current_omt_round(db, battle.id, scores_by_battle)
+        rows = [r for r in scores_by_battle.get(battle.id, ()) if r.omt_round == current_round]
+        if rows:
+            round_data = _averages_from_rows(rows, judges_needed)
+            if round_data.complete:
+                resolution = resolve_two_run_round(
+                    round_data.run1_driver1,
+                    round_data.run1_driver2,
+                    round_data.run2_driver1,
+                    round_data.run2_driver2,
+                )
+                d1_score = resolution.driver1_round_score
+                d2_score = resolution.driver2_round_score
         stats[battle.driver1_id]["points_for"] += d1_score
         stats[battle.driver1_id]["points_against"] += d2_score
         stats[battle.driver2_id]["points_for"] += d2_score
         stats[battle.driver2_id]["points_against"] += d1_score
 
+    return _rank_group(stats)
+
+
+def _rank_group(stats: dict[int, dict[str, Any]]) -> list[dict[str, Any]]:
     ranked = list(stats.values())
     ranked.sort(
         key=lambda s: (
@@ -440,12 +616,15 @@ def group_standings(db: Session, competition_id: int, group_name: str) -> list[d
     return ranked
 
 
-def _try_create_semifinals(db: Session, competition: Competition) -> bool:
-    if _has_stage(db, competition.id, "semifinal"):
+def _try_create_semifinals(
+    db: Session, competition: Competition, by_stage: dict[str, list[Battle]]
+) -> bool:
+    if by_stage.get("semifinal"):
         return False
-    if not _all_battles_completed(db, competition.id, "group", "A"):
+    group_battles = by_stage.get("group", [])
+    if not _all_battles_completed(group_battles, "A"):
         return False
-    if not _all_battles_completed(db, competition.id, "group", "B"):
+    if not _all_battles_completed(group_battles, "B"):
         return False
 
     group_a = group_standings(db, competition.id, "A")
@@ -454,7 +633,7 @@ def _try_create_semifinals(db: Session, competition: Competition) -> bool:
         return False
 
     # SF1: A1 vs B2; SF2: B1 vs A2
-    db.add(
+    semis = [
         Battle(
             competition_id=competition.id,
             stage="semifinal",
@@ -462,9 +641,7 @@ def _try_create_semifinals(db: Session, competition: Competition) -> bool:
             order_index=1,
             driver1_id=group_a[0]["driver_id"],
             driver2_id=group_b[1]["driver_id"],
-        )
-    )
-    db.add(
+        ),
         Battle(
             competition_id=competition.id,
             stage="semifinal",
@@ -472,50 +649,46 @@ def _try_create_semifinals(db: Session, competition: Competition) -> bool:
             order_index=2,
             driver1_id=group_b[0]["driver_id"],
             driver2_id=group_a[1]["driver_id"],
-        )
-    )
+        ),
+    ]
+    db.add_all(semis)
+    by_stage["semifinal"] = semis
     return True
 
 
-def _try_create_final_and_third_place(db: Session, competition: Competition) -> bool:
-    if not _has_stage(db, competition.id, "semifinal"):
-        return False
-    if not _all_battles_completed(db, competition.id, "semifinal"):
+def _try_create_final_and_third_place(
+    db: Session, competition: Competition, by_stage: dict[str, list[Battle]]
+) -> bool:
+    semis = by_stage.get("semifinal", [])
+    if not _all_battles_completed(semis):
         return False
-    if _has_stage(db, competition.id, "final") or _has_stage(db, competition.id, "third_place"):
+    if by_stage.get("final") or by_stage.get("third_place"):
         return False
 
-    semis = db.scalars(
-        select(Battle).where(
-            Battle.competition_id == competition.id,
-            Battle.stage == "semifinal",
-        ).order_by(Battle.order_index.asc())
-    ).all()
     if len(semis) != 2:
         return False
     if not all(s.winner_id and s.loser_id for s in semis):
         return False
 
-    db.add(
-        Battle(
-            competition_id=competition.id,
-            stage="third_place",
-            group_name=None,
-            order_index=1,
-            driver1_id=semis[0].loser_id,
-            driver2_id=semis[1].loser_id,
-        )
+    third_place = Battle(
+        competition_id=competition.id,
+        stage="third_place",
+        group_name=None,
+        order_index=1,
+        driver1_id=semis[0].loser_id,
+        driver2_id=semis[1].loser_id,
     )
-    db.add(
-        Battle(
-            competition_id=competition.id,
-            stage="final",
-            group_name=None,
-            order_index=1,
-            driver1_id=semis[0].winner_id,
-            driver2_id=semis[1].winner_id,
-        )
+    final = Battle(
+        competition_id=competition.id,
+        stage="final",
+        group_name=None,
+        order_index=1,
+        driver1_id=semis[0].winner_id,
+        driver2_id=semis[1].winner_id,
     )
+    db.add_all([third_place, final])
+    by_stage["third_place"] = [third_place]
+    by_stage["final"] = [final]
     return True
 
 
@@ -527,28 +700,20 @@ def _remaining_order_after_top4(db: Session, competition_id: int, excluded_drive
     return [row["driver_id"] for row in merged]
 
 
-def _finalize_competition_if_ready(db: Session, competition: Competition) -> bool:
+def _finalize_competition_if_ready(
+    db: Session, competition: Competition, by_stage: dict[str, list[Battle]]
+) -> bool:
     if competition.status == "completed":
         return False
-    if not _all_battles_completed(db, competition.id, "final"):
+    finals = by_stage.get("final", [])
+    third_places = by_stage.get("third_place", [])
+    if not _all_battles_completed(finals):
         return False
-    if not _all_battles_completed(db, competition.id, "third_place"):
+    if not _all_battles_completed(third_places):
         return False
 
-    final_battle = db.scalar(
-        select(Battle).where(
-            Battle.competition_id == competition.id,
-            Battle.stage == "final",
-        )
-    )
-    third_battle = db.scalar(
-        select(Battle).where(
-            Battle.competition_id == competition.id,
-            Battle.stage == "third_place",
-        )
-    )
-    if not final_battle or not third_battle:
-        return False
+    final_battle = finals[0]
+    third_battle = third_places[0]
     if not all([final_battle.winner_id, final_battle.loser_id, third_battle.winner_id, third_battle.loser_id]):
         return False
 
@@ -587,9 +752,18 @@ def _finalize_competition_if_ready(db: Session, competition: Competition) -> boo
 
 def try_progress_competition(db: Session, competition_id: int) -> dict[str, bool]:
     competition = get_competition_or_404(db, competition_id)
-    created_semis = _try_create_semifinals(db, competition)
-    created_finals = _try_create_final_and_third_place(db, competition)
-    finalized = _finalize_competition_if_ready(db, competition)
+    # One read of the competition's battles, bucketed by stage; the helpers
+    # work from (and append newly created battles to) this map.
+    by_stage: dict[str, list[Battle]] = defaultdict(list)
+    for battle in db.scalars(
+        select(Battle)
+        .where(Battle.competition_id == competition_id)
+        .order_by(Battle.stage, Battle.order_index)
+    ):
+        by_stage[battle.stage].append(battle)
+    created_semis = _try_create_semifinals(db, competition, by_stage)
+    created_finals = _try_create_final_and_third_place(db, competition, by_stage)
+    finalized = _finalize_competition_if_ready(db, competition, by_stage)
     return {
         "created_semifinals": created_semis,
         "created_finals": created_finals,
@@ -597,29 +771,14 @@ def try_progress_competition(db: Session, competition_id: int) -> dict[str, bool
     }
 
 
-def upsert_battle_run_score(
-    db: Session,
-    battle_id: int,
-    judge_id: int,
-    omt_round: int,
-    run_number: int,
-    driver1_points: float,
-    driver2_points: float,
-) -> dict[str, Any]:
+def _open_battle_for_scoring(db: Session, battle_id: int) -> tuple[Battle, set[int], int]:
     battle = get_battle_or_404(db, battle_id)
     if battle.status == "completed":
         raise HTTPException(status_code=400, detail="Battle already completed")
-    driver1_points = round_score(driver1_points)
-    driver2_points = round_score(driver2_points)
-    if abs((driver1_points + driver2_points) - 10.0) > 1e-9:
-        raise HTTPException(status_code=400, detail="Judge points must sum to exactly 10")
+    judge_ids = _judge_ids_cached(db, battle.competition_id)
 
-    judge_ids = competition_judge_ids(db, battle.competition_id)
-    if judge_id not in judge_ids:
-        raise HTTPException(status_code=400, detail="Judge not assigned to battle competition")
-
-    current = battle_current_omt_round(db, battle.id)
-    current_round_data = _round_averages(db, battle, current)
+    current = _current_omt_round(db, battle)
+    current_round_data = _round_averages(db, battle, current, len(judge_ids))
     if current_round_data.complete:
         # If current round has a winner, battle should already be marked complete; if tie, allow next OMT.
         resolution = resolve_two_run_round(
@@ -631,12 +790,68 @@ def upsert_battle_run_score(
         max_allowed = current + 1 if resolution.winner_slot is None else current
     else:
         max_allowed = current
+    return battle, judge_ids, max_allowed
+
 
+def _checked_battle_points(
+    judge_ids: set[int],
+    max_allowed: int,
+    judge_id: int,
+    omt_round: int,
+    driver1_points: float,
+    driver2_points: float,
+) -> tuple[float, float]:
+    driver1_points = round_score(driver1_points)
+    driver2_points = round_score(driver2_points)
+    if abs((driver1_points + driver2_points) - 10.0) > 1e-9:
+        raise HTTPException(status_code=400, detail="Judge points must sum to exactly 10")
+    if judge_id not in judge_ids:
+        raise HTTPException(status_code=400, detail="Judge not assigned to battle competition")
     if omt_round > max_allowed:
         raise HTTPException(
             status_code=400,
             detail=f"OMT round {omt_round} is not open yet. Next available is {max_allowed}",
         )
+    return driver1_points, driver2_points
+
+
+def _settle_battle_round(db: Session, battle: Battle, omt_round: int, judges_needed: int) -> None:
+    round_data = _round_averages(db, battle, omt_round, judges_needed)
+    if not round_data.complete:
+        return
+    resolution = resolve_two_run_round(
+        round_data.run1_driver1,
+        round_data.run1_driver2,
+        round_data.run2_driver1,
+        round_data.run2_driver2,
+    )
+    if resolution.winner_slot is None:
+        return
+    if resolution.winner_slot == 1:
+        battle.winner_id = battle.driver1_id
+        battle.loser_id = battle.driver2_id
+    else:
+        battle.winner_id = battle.driver2_id
+        battle.loser_id = battle.driver1_id
+    battle.status = "completed"
+
+
+def upsert_battle_run_score(
+    db: Session,
+    battle_id: int,
+    judge_id: int,
+    omt_round: int,
+    run_number: int,
+    driver1_points: float,
+    driver2_points: float,
+) -> dict[str, Any]:
+    battle, judge_ids, max_allowed = _open_battle_for_scoring(db, battle_id)
+    driver1_points, driver2_points = _checked_battle_points(
+        judge_ids, max_allowed, judge_id, omt_round, driver1_points, driver2_points
+    )
+    judges_needed = len(judge_ids)
+
+    db.info.get(_GROUP_STANDINGS_CACHE, {}).pop(battle.competition_id, None)
 
     existing = db.scalar(
         select(BattleRunScore).where(
@@ -650,9 +865,10 @@ def upsert_battle_run_score(
         existing.driver1_points = driver1_points
         existing.driver2_points = driver2_points
     else:
+        # Attach through the relationship so an eager-loaded run_scores collection stays current.
         db.add(
             BattleRunScore(
-                battle_id=battle.id,
+                battle=battle,
                 omt_round=omt_round,
                 run_number=run_number,
                 judge_id=judge_id,
@@ -665,127 +881,218 @@ def upsert_battle_run_score(
     db.flush()
 
     # Try to settle the submitted round.
-    round_data = _round_averages(db, battle, omt_round)
-    if round_data.complete:
-        resolution = resolve_two_run_round(
-            round_data.run1_driver1,
-            round_data.run1_driver2,
-            round_data.run2_driver1,
-            round_data.run2_driver2,
+    _settle_battle_round(db, battle, omt_round, judges_needed)
+
+    progression = try_progress_competition(db, battle.competition_id)
+    return {"battle": battle_state(db, battle, judges_needed), "progression": progression}
+
+
+def upsert_battle_run_scores(
+    db: Session,
+    battle_id: int,
+    rows: Iterable[tuple[int, int, int, float, float]],
+) -> dict[str, Any]:
+    # Rows are (judge_id, omt_round, run_number, driver1_points, driver2_points), written in one
+    # INSERT .. ON CONFLICT. OMT rounds are checked against the battle as it was before the batch.
+    battle, judge_ids, max_allowed = _open_battle_for_scoring(db, battle_id)
+    values = []
+    for judge_id, omt_round, run_number, driver1_points, driver2_points in rows:
+        driver1_points, driver2_points = _checked_battle_points(
+            judge_ids, max_allowed, judge_id, omt_round, driver1_points, driver2_points
         )
-        if resolution.winner_slot is not None:
-            if resolution.winner_slot == 1:
-                battle.winner_id = battle.driver1_id
-                battle.loser_id = battle.driver2_id
-            else:
-                battle.winner_id = battle.driver2_id
-                battle.loser_id = battle.driver1_id
-            battle.status = "completed"
+        values.append(
+            {
+                "battle_id": battle.id,
+                "omt_round": omt_round,
+                "run_number": run_number,
+                "judge_id": judge_id,
+                "driver1_points": driver1_points,
+                "driver2_points": driver2_points,
+            }
+        )
+    judges_needed = len(judge_ids)
+
+    if values:
+        db.info.get(_GROUP_STANDINGS_CACHE, {}).pop(battle.competition_id, None)
+        stmt = sqlite_insert(BattleRunScore).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                BattleRunScore.battle_id,
+                BattleRunScore.omt_round,
+                BattleRunScore.run_number,
+                BattleRunScore.judge_id,
+            ],
+            set_={
+                "driver1_points": stmt.excluded.driver1_points,
+                "driver2_points": stmt.excluded.driver2_points,
+            },
+        )
+        db.execute(stmt)
+        # The write bypassed the unit of work; make round queries re-read the scores.
+        db.expire(battle, ["run_scores"])
+
+        for omt_round in sorted({v["omt_round"] for v in values}):
+            _settle_battle_round(db, battle, omt_round, judges_needed)
+            if battle.status == "completed":
+                break
 
     progression = try_progress_competition(db, battle.competition_id)
-    return {"battle": battle_state(db, battle), "progression": progression}
+    return {"battle": battle_state(db, battle, judges_needed), "progression": progression}
 
 
 def list_competition_battles(
-    db: Session, competition_id: int, stage: Optional[str] = None
+    db: Session, competition_id: int, stage: Optional[str] = None, status: Optional[str] = None
 ) -> list[dict[str, Any]]:
     get_competition_or_404(db, competition_id)
-    query = select(Battle).where(Battle.competition_id == competition_id)
+    query = (
+        select(Battle)
+        .options(selectinload(Battle.run_scores))
+        .where(Battle.competition_id == competition_id)
+    )
     if stage:
         query = query.where(Battle.stage == stage)
+    if status:
+        query = query.where(Battle.status == status)
     rows = db.scalars(
         query.order_by(Battle.stage.asc(), Battle.group_name.asc(), Battle.order_index.asc(), Battle.id.asc())
     ).all()
-    return [battle_state(db, b) for b in rows]
+    judges_needed = len(_judge_ids_cached(db, competition_id))
+    return [battle_state(db, b, judges_needed) for b in rows]
+
+
+def competition_snapshot(db: Session, competition_id: int) -> tuple[str, list[dict[str, Any]]]:
+    # Competition status and its pending battles from one outer-joined SELECT.
+    rows = db.execute(
+        select(Competition.status, Battle)
+        .outerjoin(Battle, and_(Battle.competition_id == Competition.id, Battle.status == "pending"))
+        .options(selectinload(Battle.run_scores))
+        .where(Competition.id == competition_id)
+        .order_by(Battle.stage.asc(), Battle.group_name.asc(), Battle.order_index.asc(), Battle.id.asc())
+    ).all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Competition not found")
+    judges_needed = len(_judge_ids_cached(db, competition_id))
+    pending = [battle_state(db, b, judges_needed) for _, b in rows if b is not None]
+    return rows[0][0], pending
 
 
 def competition_driver_standings(db: Session, competition_id: int) -> list[dict[str, Any]]:
     get_competition_or_404(db, competition_id)
-    entries = db.scalars(
-        select(CompetitionDriver).where(CompetitionDriver.competition_id == competition_id)
-    ).all()
-    if not entries:
-        return []
-    driver_ids = [e.driver_id for e in entries]
-    drivers = {d.id: d for d in db.scalars(select(Driver).where(Driver.id.in_(driver_ids))).all()}
-
-    rows: list[dict[str, Any]] = []
-    for e in entries:
-        d = drivers[e.driver_id]
-        rows.append(
-            {
-                "driver_id": e.driver_id,
-                "driver_name": d.name,
-                "driver_number": d.number,
-                "qualifying_rank": e.qualifying_rank,
-                "qualifying_score": round_score(e.qualifying_score),
-                "group_name": e.group_name,
-                "final_place": e.final_place,
-                "competition_points": round_score(e.competition_points),
-                "qualifying_points": round_score(e.qualifying_points),
-                "total_points": round_score(e.total_points),
-            }
+    # Places, ranks and points are materialized on CompetitionDriver when the
+    # tournament starts / finishes, so the read path is a single ordered SELECT.
+    rows = db.execute(
+        select(
+            CompetitionDriver.driver_id,
+            Driver.name,
+            Driver.number,
+            CompetitionDriver.qualifying_rank,
+            CompetitionDriver.qualifying_score,
+            CompetitionDriver.group_name,
+            CompetitionDriver.final_place,
+            CompetitionDriver.competition_points,
+            CompetitionDriver.qualifying_points,
+            CompetitionDriver.total_points,
         )
-    rows.sort(
-        key=lambda r: (
-            r["final_place"] if r["final_place"] is not None else 9999,
-            r["qualifying_rank"] if r["qualifying_rank"] is not None else 9999,
-            r["driver_number"],
+        .join(Driver, Driver.id == CompetitionDriver.driver_id)
+        .where(CompetitionDriver.competition_id == competition_id)
+        .order_by(
+            CompetitionDriver.final_place.asc().nulls_last(),
+            CompetitionDriver.qualifying_rank.asc().nulls_last(),
+            Driver.number.asc(),
         )
-    )
-    return rows
+    ).all()
+    return [
+        {
+            "driver_id": driver_id,
+            "driver_name": name,
+            "driver_number": number,
+            "qualifying_rank": qualifying_rank,
+            "qualifying_score": round_score(qualifying_score),
+            "group_name": group_name,
+            "final_place": final_place,
+            "competition_points": round_score(competition_points),
+            "qualifying_points": round_score(qualifying_points),
+            "total_points": round_score(total_points),
+        }
+        for (
+            driver_id,
+            name,
+            number,
+            qualifying_rank,
+            qualifying_score,
+            group_name,
+            final_place,
+            competition_points,
+            qualifying_points,
+            total_points,
+        ) in rows
+    ]
 
 
 def global_classification_standings(db: Session, classification_id: int) -> list[dict[str, Any]]:
     classification = get_classification_or_404(db, classification_id)
-    completed_competitions = db.scalars(
-        select(Competition).where(
+    in_completed = CompetitionDriver.competition_id.in_(
+        select(Competition.id).where(
             Competition.classification_id == classification.id,
             Competition.status == "completed",
         )
-    ).all()
-    if not completed_competitions:
-        return []
+    )
 
-    competition_ids = [c.id for c in completed_competitions]
-    entries = db.scalars(
-        select(CompetitionDriver).where(CompetitionDriver.competition_id.in_(competition_ids))
+    # Per-driver totals come back one row per driver from SQLite.
+    totals = db.execute(
+        select(
+            CompetitionDriver.driver_id,
+            Driver.name,
+            Driver.number,
+            func.sum(CompetitionDriver.total_points),
+            func.count(),
+        )
+        .join(Driver, Driver.id == CompetitionDriver.driver_id)
+        .where(in_completed)
+        .group_by(CompetitionDriver.driver_id)
     ).all()
-    if not entries:
+    if not totals:
         return []
 
+    # Ordered by competition so each driver's breakdown is built already sorted.
     per_driver_scores: dict[int, list[float]] = defaultdict(list)
     per_driver_detail: dict[int, list[dict[str, Any]]] = defaultdict(list)
-    for e in entries:
-        per_driver_scores[e.driver_id].append(float(e.total_points))
-        per_driver_detail[e.driver_id].append(
+    for driver_id, competition_id, total_points, final_place in db.execute(
+        select(
+            CompetitionDriver.driver_id,
+            CompetitionDriver.competition_id,
+            CompetitionDriver.total_points,
+            CompetitionDriver.final_place,
+        )
+        .where(in_completed)
+        .order_by(CompetitionDriver.competition_id.asc())
+    ):
+        per_driver_scores[driver_id].append(float(total_points))
+        per_driver_detail[driver_id].append(
             {
-                "competition_id": e.competition_id,
-                "points": round_score(float(e.total_points)),
-                "place": e.final_place,
+                "competition_id": competition_id,
+                "points": round_score(float(total_points)),
+                "place": final_place,
             }
         )
 
-    drivers = {d.id: d for d in db.scalars(select(Driver).where(Driver.id.in_(per_driver_scores.keys()))).all()}
     rows: list[dict[str, Any]] = []
-    for driver_id, scores in per_driver_scores.items():
-        raw_total = float(sum(scores))
+    for driver_id, driver_name, driver_number, raw_total, competitions_count in totals:
+        raw_total = float(raw_total)
+        drop_lowest = classification.is_closed and competitions_count > 1
         applied_total = (
-            total_after_drop_lowest_once(scores) if classification.is_closed else raw_total
+            total_after_drop_lowest_once(per_driver_scores[driver_id]) if drop_lowest else raw_total
         )
-        d = drivers[driver_id]
         rows.append(
             {
                 "driver_id": driver_id,
-                "driver_name": d.name,
-                "driver_number": d.number,
-                "competitions_count": len(scores),
+                "driver_name": driver_name,
+                "driver_number": driver_number,
+                "competitions_count": competitions_count,
                 "raw_total_points": round_score(raw_total),
                 "effective_total_points": round_score(applied_total),
-                "drop_lowest_applied": classification.is_closed and len(scores) > 1,
-                "competition_breakdown": sorted(
-                    per_driver_detail[driver_id], key=lambda i: i["competition_id"]
-                ),
+                "drop_lowest_applied": drop_lowest,
+                "competition_breakdown": per_driver_detail[driver_id],
             }
         )
 
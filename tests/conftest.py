@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session, configure_mappers
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+import app.models  # noqa: F401  (registers the tables on Base.metadata)
+from app.database import Base
+
+# Resolve all relationships once at collection time rather than on the first query of a test.
+configure_mappers()
+
+# The schema compiled to SQLite DDL once at import, then applied in a single executescript.
+SCHEMA_SQL = ";\n".join(
+    str(ddl.compile(dialect=sqlite.dialect())).strip()
+    for table in Base.metadata.sorted_tables
+    for ddl in (CreateTable(table), *(CreateIndex(index) for index in table.indexes))
+) + ";"
+
+
+@pytest.fixture(scope="session")
+def engine():
+    # One in-memory database for the whole run; StaticPool keeps it on a single connection.
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # pysqlite defers BEGIN on its own, which breaks SAVEPOINT handling; emit it ourselves.
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    with engine.connect() as connection:
+        connection.connection.driver_connection.executescript(SCHEMA_SQL)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    # Each test runs inside an outer transaction that is rolled back on teardown;
+    # session commits only release savepoints within it.
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, autoflush=True, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
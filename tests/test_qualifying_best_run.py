@@ -1,69 +1,62 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+import pytest
+from sqlalchemy import insert
 
-from app.database import Base
 from app.models import Competition, CompetitionDriver, CompetitionJudge, Driver, GlobalClassification, Judge
-from app.services import qualifying_leaderboard, upsert_qualifying_score
-
-
-def _session() -> Session:
-    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
-    Base.metadata.create_all(bind=engine)
-    SessionLocal = sessionmaker(bind=engine, autoflush=True, autocommit=False)
-    return SessionLocal()
-
-
-def test_qualifying_uses_best_run_not_average():
-    db = _session()
-
-    cls = GlobalClassification(name="RMDS_2026")
-    db.add(cls)
-    db.flush()
-    comp = Competition(name="Round_1", classification_id=cls.id)
-    db.add(comp)
+from app.services import qualifying_is_complete, qualifying_leaderboard, upsert_qualifying_scores
+
+
+@pytest.mark.parametrize(
+    ("driver_scores", "expected_board"),
+    [
+        pytest.param(
+            # Driver 1: run1 avg rounds to 95.13, run2 avg rounds to 80.12;
+            # qualifying should be 95.13 (best run, rounded to 2 decimals).
+            # Driver 2: run1 avg rounds to 90.00, run2 avg rounds to 89.99.
+            [((95.126, 95.126), (80.124, 80.124)), ((90.004, 90.004), (89.994, 89.994))],
+            [(0, 95.13, 80.12, 95.13), (1, 90.0, 89.99, 90.0)],
+            id="rounded-floats",
+        ),
+        pytest.param(
+            # Driver 1 has the better two-run average (77.75 vs 74.5),
+            # but driver 2 has the best single run and qualifies first.
+            [((80, 90), (70, 71)), ((60, 61), (88, 89))],
+            [(1, 60.5, 88.5, 88.5), (0, 85.0, 70.5, 85.0)],
+            id="integer-scores",
+        ),
+    ],
+)
+def test_qualifying_uses_best_run_not_average(db, driver_scores, expected_board):
+    comp = Competition(name="Round_1", classification=GlobalClassification(name="RMDS_2026"))
+    drivers = [Driver(name="Driver One", number=1), Driver(name="Driver Two", number=2)]
+    judges = [Judge(name="Judge 1"), Judge(name="Judge 2")]
+    db.add_all([comp, *drivers, *judges])
     db.flush()
 
-    d1 = Driver(name="Driver One", number=1)
-    d2 = Driver(name="Driver Two", number=2)
-    db.add(d1)
-    db.add(d2)
-    db.flush()
-
-    j1 = Judge(name="Judge 1")
-    j2 = Judge(name="Judge 2")
-    db.add(j1)
-    db.add(j2)
-    db.flush()
-
-    db.add(CompetitionDriver(competition_id=comp.id, driver_id=d1.id))
-    db.add(CompetitionDriver(competition_id=comp.id, driver_id=d2.id))
-    db.add(CompetitionJudge(competition_id=comp.id, judge_id=j1.id))
-    db.add(CompetitionJudge(competition_id=comp.id, judge_id=j2.id))
+    db.execute(
+        insert(CompetitionDriver),
+        [{"competition_id": comp.id, "driver_id": d.id} for d in drivers],
+    )
+    db.execute(
+        insert(CompetitionJudge),
+        [{"competition_id": comp.id, "judge_id": j.id} for j in judges],
+    )
     db.commit()
 
-    # Driver 1: run1 avg rounds to 95.13, run2 avg rounds to 80.12
-    # qualifying should be 95.13 (best run, rounded to 2 decimals).
-    upsert_qualifying_score(db, comp.id, d1.id, j1.id, 1, 95.126)
-    upsert_qualifying_score(db, comp.id, d1.id, j2.id, 1, 95.126)
-    upsert_qualifying_score(db, comp.id, d1.id, j1.id, 2, 80.124)
-    upsert_qualifying_score(db, comp.id, d1.id, j2.id, 2, 80.124)
-
-    # Driver 2: run1 avg rounds to 90.00, run2 avg rounds to 89.99.
-    upsert_qualifying_score(db, comp.id, d2.id, j1.id, 1, 90.004)
-    upsert_qualifying_score(db, comp.id, d2.id, j2.id, 1, 90.004)
-    upsert_qualifying_score(db, comp.id, d2.id, j1.id, 2, 89.994)
-    upsert_qualifying_score(db, comp.id, d2.id, j2.id, 2, 89.994)
+    # Each driver's entry holds one score per judge for run 1, then for run 2.
+    scores = [
+        (d.id, j.id, run, score)
+        for d, runs in zip(drivers, driver_scores)
+        for run, judge_scores in enumerate(runs, start=1)
+        for j, score in zip(judges, judge_scores)
+    ]
+    upsert_qualifying_scores(db, comp.id, scores)
     db.commit()
 
     board = qualifying_leaderboard(db, comp.id)
-    assert board[0]["driver_id"] == d1.id
-    assert board[0]["run1_avg"] == 95.13
-    assert board[0]["run2_avg"] == 80.12
-    assert board[0]["qualifying_score"] == 95.13
-    assert board[1]["driver_id"] == d2.id
-    assert board[1]["run1_avg"] == 90.0
-    assert board[1]["run2_avg"] == 89.99
-    assert board[1]["qualifying_score"] == 90.0
-    assert all(item["is_complete"] for item in board)
-
-    db.close()
+    for row, (driver_idx, run1_avg, run2_avg, qualifying_score) in zip(board, expected_board):
+        assert row["driver_id"] == drivers[driver_idx].id
+        assert row["run1_avg"] == run1_avg
+        assert row["run2_avg"] == run2_avg
+        assert row["qualifying_score"] == qualifying_score
+    assert len(board) == len(expected_board)
+    assert qualifying_is_complete(db, comp.id)
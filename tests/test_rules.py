@@ -21,6 +21,12 @@ def test_order_battles_prefers_non_consecutive_when_available():
     assert set(ordered[0]).intersection(set(ordered[1])) == set()
 
 
+def test_order_battles_falls_back_to_least_overlap():
+    # Every pair shares a driver, so each pick takes the lowest pair with the least overlap.
+    ordered = order_battles_avoid_consecutive([(2, 3), (1, 3), (1, 2)])
+    assert ordered == [(1, 2), (1, 3), (2, 3)]
+
+
 def test_resolve_two_run_round_winner_and_tie():
     winner = resolve_two_run_round(6.0, 4.0, 6.0, 4.0)
     assert winner.winner_slot == 1
@@ -43,6 +49,8 @@ def test_competition_points_scale():
     assert competition_points_for_place(17) == 16
     assert competition_points_for_place(32) == 16
     assert competition_points_for_place(33) == 0
+    assert competition_points_for_place(0) == 0
+    assert competition_points_for_place(-1) == 0
 
 
 def test_drop_lowest_once():
@@ -1,82 +1,64 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import insert
 
-from app.database import Base
 from app.models import Competition, CompetitionDriver, CompetitionJudge, Driver, GlobalClassification, Judge
 from app.services import (
     competition_driver_standings,
+    competition_snapshot,
     list_competition_battles,
     start_tournament,
-    upsert_battle_run_score,
-    upsert_qualifying_score,
+    upsert_battle_run_scores,
+    upsert_qualifying_scores,
 )
 
 
-def _session() -> Session:
-    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
-    Base.metadata.create_all(bind=engine)
-    SessionLocal = sessionmaker(bind=engine, autoflush=True, autocommit=False)
-    return SessionLocal()
-
-
-def test_competition_progresses_to_completed():
-    db = _session()
-
-    cls = GlobalClassification(name="RMDS_2026")
-    db.add(cls)
+def test_competition_progresses_to_completed(db):
+    comp = Competition(name="Round_1", classification=GlobalClassification(name="RMDS_2026"))
+    drivers = [Driver(name=f"Driver {i}", number=i) for i in range(1, 5)]
+    judges = [Judge(name=f"Judge {i}") for i in range(1, 3)]
+    db.add_all([comp, *drivers, *judges])
     db.flush()
-    comp = Competition(name="Round_1", classification_id=cls.id)
-    db.add(comp)
-    db.flush()
-
-    drivers = []
-    for i in range(1, 5):
-        d = Driver(name=f"Driver {i}", number=i)
-        db.add(d)
-        db.flush()
-        db.add(CompetitionDriver(competition_id=comp.id, driver_id=d.id))
-        drivers.append(d)
-
-    judges = []
-    for i in range(1, 3):
-        j = Judge(name=f"Judge {i}")
-        db.add(j)
-        db.flush()
-        db.add(CompetitionJudge(competition_id=comp.id, judge_id=j.id))
-        judges.append(j)
-
+    db.execute(
+        insert(CompetitionDriver),
+        [{"competition_id": comp.id, "driver_id": d.id} for d in drivers],
+    )
+    db.execute(
+        insert(CompetitionJudge),
+        [{"competition_id": comp.id, "judge_id": j.id} for j in judges],
+    )
     db.commit()
 
     # Complete qualifying with descending scores.
-    score = 90.0
-    for d in drivers:
-        for j in judges:
-            for run in (1, 2):
-                upsert_qualifying_score(db, comp.id, d.id, j.id, run, score)
-        score -= 5
+    scores = [
+        (d.id, j.id, run, 90.0 - 5 * i)
+        for i, d in enumerate(drivers)
+        for j in judges
+        for run in (1, 2)
+    ]
+    upsert_qualifying_scores(db, comp.id, scores)
     db.commit()
 
     start_tournament(db, comp.id)
     db.commit()
 
-    # Resolve all battles by giving driver1 a clear advantage.
-    for _ in range(6):
-        battles = list_competition_battles(db, comp.id)
-        pending = [b for b in battles if b["status"] == "pending"]
-        if not pending:
-            break
+    # Resolve all battles by giving driver1 a clear advantage. Each bracket round
+    # (groups, semifinals, finals) only exists once the previous one is scored,
+    # so battles are fetched once per round; the whole bracket is committed once.
+    for _ in range(3):
+        status, pending = competition_snapshot(db, comp.id)
+        assert status == "tournament"
+        assert pending
         for b in pending:
-            for j in judges:
-                for run in (1, 2):
-                    upsert_battle_run_score(db, b["id"], j.id, 0, run, 6.0, 4.0)
-            db.commit()
+            upsert_battle_run_scores(
+                db, b["id"], [(j.id, 0, run, 6.0, 4.0) for j in judges for run in (1, 2)]
+            )
+    db.commit()
 
-    comp = db.get(Competition, comp.id)
-    assert comp is not None
-    assert comp.status == "completed"
+    status, pending = competition_snapshot(db, comp.id)
+    assert status == "completed"
+    assert pending == []
+    # Two single-battle groups, two semifinals, the final and the third-place battle.
+    assert len(list_competition_battles(db, comp.id, status="completed")) == 6
 
     standings = competition_driver_standings(db, comp.id)
     places = sorted(s["final_place"] for s in standings if s["final_place"] is not None)
     assert places[:4] == [1, 2, 3, 4]
-
-    db.close()